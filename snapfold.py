@@ -6,10 +6,13 @@ Compactly bundle your HTML/CSS/JS project into a single markdown snapshot.
 
 import os
 import re
+import sys
+import stat
 import time
-import json
+import functools
+import collections
+import concurrent.futures
 from pathlib import Path
-from datetime import datetime
 
 # ───────────────────────────────
 # Terminal color codes
@@ -42,6 +45,12 @@ DEFAULT_CONFIG = {
 # ───────────────────────────────
 # Config file helpers
 # ───────────────────────────────
+_NUM_START_RE = re.compile(r"^[0-9]")
+_SIZE_RE = re.compile(r"^([0-9.]+)\s*(kb|mb|gb)?$")
+_UNIT_MULT = {"kb": 1024, "mb": 1024**2, "gb": 1024**3, "": 1}
+
+
+
 def create_default_config(path="snapfold.config"):
     """Create default config file if not found."""
     if not os.path.exists(path):
@@ -83,7 +92,17 @@ naming_mode = increment
 
 
 def parse_config_file(path):
-    """Parse .config files with key=value syntax."""
+    """Parse .config files with key=value syntax.
+
+    Parsed results are cached per (path, mtime, size), so repeat calls in
+    the same process are O(1) while edits to the file invalidate the cache.
+    """
+    st = os.stat(path)
+    return _parse_config_cached(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_cached(path, mtime_ns, size):
     conf = {}
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
@@ -98,13 +117,12 @@ def parse_config_file(path):
                     value = value.lower() == "true"
 
                 # Handle human-readable sizes (e.g. "2MB")
-                elif re.match(r"^[0-9]", value):
-                    match = re.match(r"^([0-9.]+)\s*(kb|mb|gb)?$", value.lower())
+                elif _NUM_START_RE.match(value):
+                    match = _SIZE_RE.match(value.lower())
                     if match:
                         num = float(match.group(1))
                         unit = match.group(2) or ""
-                        mult = {"kb": 1024, "mb": 1024**2, "gb": 1024**3}.get(unit, 1)
-                        value = int(num * mult)
+                        value = int(num * _UNIT_MULT.get(unit, 1))
 
                 # Handle lists
                 elif "," in value:
@@ -124,28 +142,57 @@ def load_config():
 # ───────────────────────────────
 # File system helpers
 # ───────────────────────────────
+# One record per collected file, computed once during traversal so later
+# phases never touch pathlib again: absolute path, root-relative path,
+# extension without the dot, and size in bytes.
+FileEntry = collections.namedtuple("FileEntry", ["path", "rel", "suffix", "size"])
+
+
+def _scandir_recursive(path, ignore, only_exts):
+    """Walk a directory tree with os.scandir, yielding (path, suffix, size).
+
+    Ignored directories are pruned before recursing, and the extension
+    filter runs before the size lookup, so rejected files never trigger a
+    stat at all; accepted files cost a single DirEntry-cached stat.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name in ignore or entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path, ignore, only_exts)
+                else:
+                    suffix = os.path.splitext(entry.name)[1].lstrip(".")
+                    if only_exts is not None and suffix.lower() not in only_exts:
+                        continue
+                    # One stat covers both the regular-file check and the size.
+                    st = entry.stat(follow_symlinks=True)
+                    if stat.S_ISREG(st.st_mode):
+                        yield entry.path, suffix, st.st_size
+    except PermissionError:
+        pass
+
+
 def list_files(root, config):
-    """Recursively gather files."""
-    ignore = set(config["ignore"])
+    """Recursively gather files as FileEntry records."""
+    ignore = frozenset(config["ignore"])
+    only_exts = frozenset(config["only_formats"]) if config["enable_only_formats"] else None
     collected = []
-    root = Path(root)
+    root_str = str(root)
+    rel_start = len(root_str.rstrip(os.sep)) + 1
 
-    for path in root.rglob("*"):
-        if path.is_file():
-            if any(ig in path.parts for ig in ignore):
-                continue
-            if path.stat().st_size > config["max_file_size"]:
-                continue
-            if config["enable_only_formats"]:
-                ext = path.suffix.lstrip(".").lower()
-                if ext not in config["only_formats"]:
-                    continue
-            collected.append(path)
+    for path, suffix, size in _scandir_recursive(root_str, ignore, only_exts):
+        if size > config["max_file_size"]:
+            continue
+        collected.append(FileEntry(path, path[rel_start:], suffix, size))
     return collected
 
 
 def get_unique_output_path(config):
     """Determine output path based on naming_mode."""
+    from datetime import datetime
+
     out = Path(config["output"]).resolve()
     folder = out.parent
     stem = out.stem
@@ -159,12 +206,18 @@ def get_unique_output_path(config):
         return folder / f"{stem}-{ts}{ext}"
 
     elif naming_mode == "increment":
-        i = 1
         final_path = folder / f"{stem}{ext}"
-        while final_path.exists():
-            i += 1
-            final_path = folder / f"{stem}({i}){ext}"
-        return final_path
+        if not final_path.exists():
+            return final_path
+        # One directory listing instead of a stat per existing snapshot.
+        pattern = re.compile(rf"{re.escape(stem)}\((\d+)\){re.escape(ext)}$")
+        highest = 1
+        with os.scandir(folder) as it:
+            for entry in it:
+                match = pattern.fullmatch(entry.name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+        return folder / f"{stem}({highest + 1}){ext}"
 
     elif naming_mode == "overwrite":
         return folder / f"{stem}{ext}"
@@ -175,56 +228,125 @@ def get_unique_output_path(config):
 # ───────────────────────────────
 # Output helpers
 # ───────────────────────────────
-def generate_tree(root, files):
-    """Generate folder tree view."""
-    tree = {}
-    for f in files:
-        rel = Path(f).relative_to(root)
-        parts = rel.parts
-        cur = tree
-        for p in parts[:-1]:
-            cur = cur.setdefault(p, {})
-        cur[parts[-1]] = None
-
-    def render(subtree, prefix=""):
-        out = ""
-        for i, (name, val) in enumerate(sorted(subtree.items())):
-            connector = "└── " if i == len(subtree) - 1 else "├── "
-            out += prefix + connector + name + "\n"
-            if isinstance(val, dict):
-                ext = "    " if i == len(subtree) - 1 else "│   "
-                out += render(val, prefix + ext)
-        return out
-
-    return render(tree)
-
-
-def bundle_files(files, root, config):
-    """Bundle all files into one markdown."""
-    md = "# 📦 SnapFold Project Snapshot\n\n"
-    md += f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+def generate_tree(files):
+    """Generate folder tree view.
+
+    Works off a single sorted list of path-part tuples: each entry is
+    diffed against the previous one and only the diverging components
+    emit new lines. Nodes start as "last sibling" and are demoted when a
+    later entry introduces a sibling at their depth.
+    """
+    entries = sorted(tuple(f.rel.split(os.sep)) for f in files)
+
+    lines = []  # [depth, name, is_last], finalized after the scan
+    open_idx = []  # per-depth index into lines of the still-open node
+    prev = ()
+    for parts in entries:
+        common = 0
+        for a, b in zip(prev, parts):
+            if a != b:
+                break
+            common += 1
+        if common < len(open_idx):
+            lines[open_idx[common]][2] = False
+            del open_idx[common:]
+        for depth in range(common, len(parts)):
+            open_idx.append(len(lines))
+            lines.append([depth, parts[depth], True])
+        prev = parts
+
+    out = []
+    bars = []  # per-ancestor-depth: True if that ancestor was a last sibling
+    for depth, name, is_last in lines:
+        del bars[depth:]
+        prefix = "".join("    " if last else "│   " for last in bars)
+        connector = "└── " if is_last else "├── "
+        out.append(prefix + connector + name + "\n")
+        bars.append(is_last)
+    return "".join(out)
+
+
+def _looks_binary(chunk):
+    """Heuristic binary check: NUL byte or invalid UTF-8 in the sample."""
+    if b"\x00" in chunk:
+        return True
+    try:
+        chunk.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte sequence split at the chunk boundary is still text.
+        return e.start < len(chunk) - 3
+    return False
+
+
+def _read_file(entry):
+    """Read one source file; runs on a worker thread.
+
+    Sniffs the first 4KB and bails out with a short marker for binary
+    files, so a misclassified PNG or font never gets read in full.
+    """
+    with open(entry.path, "rb") as src:
+        head = src.read(4096)
+        if _looks_binary(head):
+            return f"[binary file skipped: {entry.size} bytes]".encode("utf-8")
+        return head + src.read()
+
+
+def write_bundle(files, config, fp):
+    """Stream all files as one markdown document into an open binary handle.
+
+    File reads are prefetched on a thread pool with a bounded in-flight
+    window, while a single consumer writes results in the original order.
+    Source bytes are copied straight through without a UTF-8 decode/encode
+    round-trip; only the markdown scaffolding is encoded here.
+    """
+    from datetime import datetime
+
+    fp.write("# 📦 SnapFold Project Snapshot\n\n".encode("utf-8"))
+    fp.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n".encode("utf-8"))
 
     if config["include_tree"]:
-        md += "## 📁 Project Structure\n"
-        md += "```\n" + generate_tree(root, files) + "```\n\n"
-
-    for f in files:
-        rel = Path(f).relative_to(root)
-        md += f"---\n### `{rel}`\n```{f.suffix.lstrip('.')}\n"
-        try:
-            content = Path(f).read_text(encoding="utf-8")
-        except Exception as e:
-            content = f"[Error reading file: {e}]"
-        md += content + "\n```\n\n"
-
-    return md
-
+        fp.write("## 📁 Project Structure\n".encode("utf-8"))
+        fp.write(("```\n" + generate_tree(files) + "```\n\n").encode("utf-8"))
 
-def save_output(md, config):
-    """Save markdown to file."""
+    total = len(files)
+    step = max(1, total // 100)
+    window = 64  # max outstanding reads, caps prefetch memory
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4)
+    ) as pool:
+        pending = collections.deque(
+            pool.submit(_read_file, f) for f in files[:window]
+        )
+        for i, f in enumerate(files, 1):
+            if i % step == 0 or i == total:
+                progress_bar(i, total)
+            future = pending.popleft()
+            if i - 1 + window < total:
+                pending.append(pool.submit(_read_file, files[i - 1 + window]))
+            fp.write(f"---\n### `{f.rel}`\n```{f.suffix}\n".encode("utf-8"))
+            try:
+                fp.write(future.result())
+            except Exception as e:
+                fp.write(f"[Error reading file: {e}]".encode("utf-8"))
+            fp.write(b"\n```\n\n")
+
+
+def save_output(files, config):
+    """Stream the bundled markdown to the output file.
+
+    Writes go to a temp file that is atomically swapped into place, so a
+    crash mid-write never leaves a torn snapshot behind.
+    """
     path = get_unique_output_path(config)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(md)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp, "wb", buffering=1 << 20) as fp:
+            write_bundle(files, config, fp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
     print(f"\n{C.GREEN}✨ Output saved as:{C.RESET} {C.BOLD}{path.name}{C.RESET}")
     print(f"{C.DIM}📂 {path.parent}{C.RESET}")
@@ -234,11 +356,24 @@ def save_output(md, config):
 # ───────────────────────────────
 # Progress bar
 # ───────────────────────────────
+_progress_last_filled = -1
+_progress_last_flush = 0.0
+
+
 def progress_bar(current, total, width=30):
+    """Redraw the bar only when it visibly changes, flushing at most ~20x/s."""
+    global _progress_last_filled, _progress_last_flush
     filled = int(width * current / total)
+    if filled == _progress_last_filled and current != total:
+        return
+    _progress_last_filled = filled
     bar = "█" * filled + "░" * (width - filled)
     percent = (current / total) * 100
-    print(f"\rBundling [{bar}] {percent:5.1f}%", end="", flush=True)
+    sys.stdout.write(f"\rBundling [{bar}] {percent:5.1f}%")
+    now = time.monotonic()
+    if now - _progress_last_flush >= 0.05 or current == total:
+        sys.stdout.flush()
+        _progress_last_flush = now
 
 # ───────────────────────────────
 # Main execution
@@ -252,13 +387,7 @@ def main():
     print(f"\n{C.GREEN}🚀 SnapFold running...{C.RESET}")
     print(f"Scanning: {root}\n")
 
-    total = len(files)
-    for i, _ in enumerate(files, 1):
-        progress_bar(i, total)
-        time.sleep(0.01)  # Smooth animation
-
-    md = bundle_files(files, root, config)
-    save_output(md, config)
+    save_output(files, config)
 
     elapsed = time.time() - start_time
     print(f"{C.BOLD}⏱️  Completed in {elapsed:.2f} seconds{C.RESET}\n")